@@ -35,6 +35,12 @@ version: """ + __version__.version
 ORIGIN = datetime(1858, 11, 17, 0, 0, 0, 0, tzinfo=UTC)
 OFFSET = 2400000.5
 
+# Patterns used by str2mjd to pick out the date and time, ignoring any
+# trailing fractions of a second.
+DATETIME_PATTERN = re.compile(
+    r'[^\d]*(\d{1,4}-\d{2}-\d{2})[ Tt](\d{2}:\d{2}:\d{2}).*')
+DATE_PATTERN = re.compile(r'[^\d]*(\d{1,4}-\d{2}-\d{2}).*')
+
 
 def utc2mjd(dt):
     """
@@ -72,13 +78,10 @@ def str2mjd(dt_string, format='%Y-%m-%dT%H:%M:%S'):
     format:    the format needed to read the datetime
     """
     # Strip off trailing fractions of a second.
-    if re.match(r'[^\d]*(\d{1,4}-\d{2}-\d{2})[ Tt](\d{2}:\d{2}:\d{2}).*',
-                dt_string):
-        dt = re.sub(r'[^\d]*(\d{1,4}-\d{2}-\d{2})[ Tt](\d{2}:\d{2}:\d{2}).*',
-                    r'\1T\2', dt_string)
-    elif re.match(r'[^\d]*(\d{1,4}-\d{2}-\d{2}).*', dt_string):
-        dt = re.sub(r'[^\d]*(\d{1,4}-\d{2}-\d{2}).*', r'\1T00:00:00',
-                    dt_string)
+    if DATETIME_PATTERN.match(dt_string):
+        dt = DATETIME_PATTERN.sub(r'\1T\2', dt_string)
+    elif DATE_PATTERN.match(dt_string):
+        dt = DATE_PATTERN.sub(r'\1T00:00:00', dt_string)
     else:
         raise ValueError('the string "%s" does not match a date'
                          'or datetime format' % (dt_string))
@@ -31,6 +31,13 @@ from tools4caom2.tapclient import tapclient_luskan
 
 logger = logging.getLogger(__name__)
 
+# Patterns used to generalize a file_id to search for related files.
+REDUCED_PATTERN = re.compile(r'_(reduced|rimg|rsp|healpix)\d*')
+PREVIEW_PATTERN = re.compile(r'_preview_\d+')
+
+# Pattern used to extract the error count from fitsverify output.
+FITSVERIFY_ERROR_PATTERN = re.compile(r'.*?\s(\d+) errors.*')
+
 
 class CAOMValidationError(CAOMError):
     """
@@ -94,8 +101,8 @@ class CAOMValidation:
 
         # Generalize file_id to a pattern to search for multiple files at once.
         pattern = file_id
-        pattern = re.sub('_(reduced|rimg|rsp|healpix)\d*', '_%', pattern)
-        pattern = re.sub('_preview_\d+', '_preview_%', pattern)
+        pattern = REDUCED_PATTERN.sub('_%', pattern)
+        pattern = PREVIEW_PATTERN.sub('_preview_%', pattern)
 
         if pattern in self.archive_cache:
             archive_result = self.archive_cache[pattern]
@@ -137,10 +144,10 @@ class CAOMValidation:
         except:
             output = 'unexpected exception: 1 errors'
 
-        if re.search(r'\s*verification OK', output):
+        if 'verification OK' in output:
             error_count = '0'
         else:
-            error_count = re.sub(r'.*?\s(\d+) errors.*', r'\1', output)
+            error_count = FITSVERIFY_ERROR_PATTERN.sub(r'\1', output)
 
         if int(error_count):
             raise CAOMValidationError('file {0} failed fitsverify'.format(
@@ -156,7 +163,7 @@ class CAOMValidation:
         key      : mandatory keyword
         """
 
-        if (key not in header) or (header[key] == fits.card.UNDEFINED):
+        if header.get(key, fits.card.UNDEFINED) == fits.card.UNDEFINED:
             raise CAOMValidationError('file {0} lacks header {1}'.format(
                 filename, key))
 
@@ -172,13 +179,15 @@ class CAOMValidation:
         value_list : list of acceptable values
         """
 
-        if key in header and header[key] != fits.card.UNDEFINED:
-            if header[key] in value_list:
-                return
+        value = header.get(key, fits.card.UNDEFINED)
 
+        if value == fits.card.UNDEFINED:
             raise CAOMValidationError(
-                'file {0} header {1} ({2}) should be in {3!r}'.format(
-                    filename, key, header[key], value_list))
+                'file {0} lacks restricted header {1}'.format(filename, key))
+
+        if value in value_list:
+            return
 
         raise CAOMValidationError(
-            'file {0} lacks restricted header {1}'.format(filename, key))
+            'file {0} header {1} ({2}) should be in {3!r}'.format(
+                filename, key, value, value_list))
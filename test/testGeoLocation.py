@@ -14,8 +14,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from math import sqrt
-import os.path
-import sys
 import unittest
 
 from tools4caom2.geolocation import geolocation
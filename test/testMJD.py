@@ -16,14 +16,37 @@
 
 
 from datetime import datetime, timedelta
-import os.path
 from pytz import UTC
-import sys
 import unittest
 
 from tools4caom2.mjd import utc2mjd, mjd2utc, str2mjd, mjd2str
 
 
+def _days_2010():
+    """
+    Return a tuple of (date string, MJD) pairs for midnight at the start of
+    each day in 2010.
+    """
+    dateformat = '2010-%02d-%02dT00:00:00'
+    days = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+    mjd0 = 55197.0
+    result = []
+    for month in range(12):
+        for day in range(days[month]):
+            result.append((dateformat % (month + 1, day + 1), mjd0 + day))
+        mjd0 += days[month]
+    return tuple(result)
+
+
+START_2010 = datetime(2010, 1, 1, tzinfo=UTC)
+
+DAYS_2010 = _days_2010()
+
+# Each minute of the first day of 2010.
+MINUTES_2010 = tuple('2010-01-01T%02d:%02d:00' % (hour, minute)
+                     for hour in range(24) for minute in range(60))
+
+
 class testMJDConversions(unittest.TestCase):
     def testUTC_StartOfYear(self):
         for (year, value) in ((2000, 51544.0),
@@ -34,26 +57,18 @@ class testMJDConversions(unittest.TestCase):
             self.assertEqual(utc2mjd(datetime(year, 1, 1, tzinfo=UTC)), value)
 
     def testUTC_DOY(self):
-        start2010 = datetime(2010, 1, 1, tzinfo=UTC)
-        for doy in range(365):
-            self.assertEqual(utc2mjd(start2010 + timedelta(days=doy)),
-                             55197.0 + doy)
+        self.assertEqual(
+            [utc2mjd(START_2010 + timedelta(days=doy)) for doy in range(365)],
+            [55197.0 + doy for doy in range(365)])
 
     def testUTC_ToFrom(self):
-        start2010 = datetime(2010, 1, 1, tzinfo=UTC)
-        for doy in range(365):
-            utin = start2010 + timedelta(days=doy)
-            mjd = utc2mjd(utin)
-            utout = mjd2utc(mjd)
-            self.assertEqual(utin, utout)
+        utin = [START_2010 + timedelta(days=doy) for doy in range(365)]
+        self.assertEqual([mjd2utc(utc2mjd(ut)) for ut in utin], utin)
 
     def testUTC_FractionsOfDays(self):
-        start2010 = datetime(2010, 1, 1, tzinfo=UTC)
-        for minutes in range(24 * 60):
-            utin = start2010 + timedelta(minutes=minutes)
-            mjd = utc2mjd(utin)
-            utout = mjd2utc(mjd)
-            self.assertEqual(utin, utout)
+        utin = [START_2010 + timedelta(minutes=minutes)
+                for minutes in range(24 * 60)]
+        self.assertEqual([mjd2utc(utc2mjd(ut)) for ut in utin], utin)
 
     def testSTR_StartOfYear(self):
         for (year, value) in (('2000-01-01T00:00:00', 51544.0),
@@ -65,37 +80,17 @@ class testMJDConversions(unittest.TestCase):
             self.assertEqual(str2mjd(year), value)
 
     def testSTR_DOY(self):
-        dateformat = '2010-%02d-%02dT00:00:00'
-        mjd0 = 55197.0
-        for month in range(12):
-            days = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
-            for day in range(days[month]):
-                datestr = dateformat % (month + 1, day + 1)
-                self.assertEqual(str2mjd(datestr), mjd0 + day)
-            mjd0 += days[month]
+        self.assertEqual([str2mjd(datestr) for (datestr, mjd) in DAYS_2010],
+                         [mjd for (datestr, mjd) in DAYS_2010])
 
     def testSTR_ToFrom(self):
-        dateformat = '2010-%02d-%02dT00:00:00'
-        for month in range(12):
-            days = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
-            for day in range(days[month]):
-                datein = dateformat % (month+1, day+1)
-                mjd = str2mjd(datein)
-                dateout = mjd2str(mjd)
-                if len(dateout) > len(datein):
-                    dateout = dateout[:len(datein)]
-                self.assertEqual(datein, dateout)
+        datein = [datestr for (datestr, mjd) in DAYS_2010]
+        self.assertEqual([mjd2str(str2mjd(d))[:len(d)] for d in datein],
+                         datein)
 
     def testSTR_FractionsOfDays(self):
-        dateformat = '2010-01-01T%02d:%02d:00'
-        for hour in range(24):
-            for minute in range(60):
-                datein = dateformat % (hour, minute)
-                mjd = str2mjd(datein)
-                dateout = mjd2str(mjd)
-                if len(dateout) > len(datein):
-                    dateout = dateout[:len(datein)]
-                self.assertEqual(datein, dateout)
+        self.assertEqual([mjd2str(str2mjd(d))[:len(d)] for d in MINUTES_2010],
+                         list(MINUTES_2010))
 
     def testSTR_BadStrings(self):
         bad = ('2000-00-01T00:00:00',
@@ -105,6 +100,8 @@ class testMJDConversions(unittest.TestCase):
                '2000-01-01T24:00:00',
                '2000-01-01T00:60:00',
                '2000-01-01T00:00:60',
-               'bogus_string')
+               'bogus_string',
+               '2010-01-01T00:00:00\nfoo',
+               '2010-01-01\n2011-01-01')
         for s in bad:
             self.assertRaises(ValueError, str2mjd, s)
@@ -16,71 +16,102 @@
 
 from __future__ import absolute_import
 
+from datetime import datetime
 import os
 import re
 import shutil
 import tempfile
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
 
 from astropy.io import fits
-import numpy
 
+from tools4caom2.tapclient import tapclient_luskan
 from tools4caom2.validation import CAOMValidation, CAOMValidationError
 from tools4caom2.util import make_file_id
 
 from .write_fits import write_fits
 
+FILE_ID_REGEXES = [
+    re.compile(r'^test_.*\.fits$'),
+    re.compile(r'^archive_.*\.fits$'),
+    re.compile(r'^TEST_.*\.png$'),
+]
+
+# Some tests need external resources.  Check for them once, so that the
+# tests can be skipped straight away rather than waiting for a failure.
+HAVE_FITSVERIFY = which('fitsverify') is not None
+HAVE_CADC_PROXY = os.path.exists(tapclient_luskan().cadcproxy)
+
 
 class test_validation(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Create a temp directory and validation object.  The
+        Create a temp directory holding the test files.  The
         temporary directory must be shared amongst several subprocesses, so we
         cannot use mkdtemp.
+
+        None of the tests modify these files, so they are written once for
+        the whole class.
         """
-        self.tmpdir = tempfile.mktemp(dir='/tmp')
-        os.mkdir(self.tmpdir)
+        # Prefer a memory-backed filesystem where one is available.
+        tmpbase = '/dev/shm' if os.access('/dev/shm', os.W_OK) else '/tmp'
+        cls.tmpdir = tempfile.mktemp(dir=tmpbase)
+        os.mkdir(cls.tmpdir)
 
-        fileid_regexes = [
-            re.compile(r'^test_.*\.fits$'),
-            re.compile(r'^archive_.*\.fits$'),
-            re.compile(r'^TEST_.*\.png$'),
-        ]
-
-        self.validation = CAOMValidation(
-            'JCMT', fileid_regexes, make_file_id)
+        datestring = datetime.utcnow().isoformat()
 
         # Create fits files with suitable test headers
-        self.test_file = os.path.join(self.tmpdir, 'test_file.fits')
-        write_fits(self.test_file,
+        cls.test_file = os.path.join(cls.tmpdir, 'test_file.fits')
+        write_fits(cls.test_file,
                    numexts=0,
                    obsid='obs1',
-                   product='A')
+                   product='A',
+                   datestring=datestring)
 
-        self.archive_file = os.path.join(self.tmpdir, 'archive_file.fits')
-        write_fits(self.archive_file,
+        # The header checks only read the header, so parse it just once
+        cls.test_header = fits.getheader(cls.test_file, 0)
+
+        cls.archive_file = os.path.join(cls.tmpdir, 'archive_file.fits')
+        write_fits(cls.archive_file,
                    numexts=0,
                    obsid='obs1',
-                   product='B')
+                   product='B',
+                   datestring=datestring)
 
-        self.bogus_file = os.path.join(self.tmpdir, 'bogus_file.fits')
-        write_fits(self.bogus_file,
+        cls.bogus_file = os.path.join(cls.tmpdir, 'bogus_file.fits')
+        write_fits(cls.bogus_file,
                    numexts=0,
                    obsid='obs2',
                    product='A',
-                   badheader=('EPOCH', 2000.0))  # deprecated header warning
+                   badheader=('EPOCH', 2000.0),  # deprecated header warning
+                   datestring=datestring)
 
         # Add a non-FITS file to verify filtering
-        self.empty_file = os.path.join(self.tmpdir, 'empty_file.txt')
-        TEXT = open(self.empty_file, 'w')
-        TEXT.close()
+        cls.empty_file = os.path.join(cls.tmpdir, 'empty_file.txt')
+        with open(cls.empty_file, 'w'):
+            pass
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """
         Delete the temporary directory.
         """
 
-        shutil.rmtree(self.tmpdir)
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        """
+        Create a fresh validation object, so that its archive cache is not
+        shared between tests.
+        """
+
+        self.validation = CAOMValidation(
+            'JCMT', FILE_ID_REGEXES, make_file_id)
 
     def testCheckSize(self):
         """
@@ -103,6 +134,7 @@ class test_validation(TestCase):
         with self.assertRaises(CAOMValidationError):
             self.validation.check_name(self.bogus_file)
 
+    @skipUnless(HAVE_CADC_PROXY, 'CADC proxy certificate not found')
     def testIsInArchive(self):
         """
         Verify that is_in_archive identifies files that are/are not in the
@@ -116,6 +148,7 @@ class test_validation(TestCase):
         with self.assertRaises(CAOMValidationError):
             self.validation.is_in_archive(self.test_file)
 
+    @skipUnless(HAVE_FITSVERIFY, 'fitsverify not found')
     def testVerifyFits(self):
         """
         Verify that verify_fits rejects files that report errors.
@@ -132,7 +165,7 @@ class test_validation(TestCase):
         Verify that expect_keyword rejects files missing mandatory headers.
         """
 
-        header = fits.getheader(self.test_file, 0)
+        header = self.test_header
 
         self.validation.expect_keyword(self.test_file, 'DPDATE', header)
 
@@ -147,7 +180,7 @@ class test_validation(TestCase):
         Verify that restricted_value rejects files with invalid header values.
         """
 
-        header = fits.getheader(self.test_file, 0)
+        header = self.test_header
 
         self.validation.restricted_value(self.test_file, 'COLLECT', header,
                                          ['TEST', 'JCMT'])
@@ -155,3 +188,7 @@ class test_validation(TestCase):
         with self.assertRaises(CAOMValidationError):
             self.validation.restricted_value(self.test_file, 'PRODUCT', header,
                                              ['X', 'Y', 'Z'])
+
+        with self.assertRaises(CAOMValidationError):
+            self.validation.restricted_value(self.test_file, 'ASN_ID', header,
+                                             ['X', 'Y', 'Z'])
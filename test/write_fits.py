@@ -20,6 +20,67 @@ import os.path
 import numpy
 from astropy.io import fits
 
+# Data array shared by every HDU written by write_fits.  It is never modified
+# so there is no need to allocate a fresh array for each file.
+FAKE_DATA = numpy.arange(10)
+FAKE_DATA.setflags(write=False)
+
+
+def _common_cards(obsid, hduproduct, datestring):
+    """
+    Return the header cards which are common to the primary HDU and to
+    each of the extensions.
+
+    Arguments:
+    obsid      : observation identifier
+    hduproduct : PRODUCT value for this HDU
+    datestring : DPDATE value
+    """
+    return [
+        ('OBSID', obsid),
+
+        # DPDATE will be different every time the program runs, so it should be
+        # possible to verify that the files have been updated in AD by checking
+        # this header.
+        ('DPDATE', datestring),
+
+        ('PRODUCT', hduproduct),
+        ('FIELD1', 'F1' + hduproduct),
+        ('FIELD2', 'F2' + hduproduct),
+    ]
+
+
+def _dependent_cards(product, primary):
+    """
+    Return the product- and extension-dependent header cards.
+
+    Arguments:
+    product    : product type of the file
+    primary    : True for the primary HDU, False for an extension
+    """
+    # Some product-dependent headers
+    if product != 'A':
+        cards = [
+            ('FIELD3', 'F3' + product),
+            ('NOTA', True),
+        ]
+    else:
+        cards = [('NOTA', False)]
+
+    # Some extension-dependent headers
+    if primary:
+        cards.extend([
+            ('FIELD4', 'BAD'),
+            ('FIELD5', 'GOOD'),
+        ])
+    else:
+        cards.extend([
+            ('FIELD4', 'GOOD'),
+            ('FIELD5', 'BAD'),
+        ])
+
+    return cards
+
 
 def write_fits(filepath,
                numexts,
@@ -27,7 +88,8 @@ def write_fits(filepath,
                product,
                member=None,
                provenance=None,
-               badheader=None):
+               badheader=None,
+               datestring=None):
     """
     Write a FITS test file with the requested PRODUCT keyword and number
     of extensions.
@@ -36,102 +98,76 @@ def write_fits(filepath,
     filepath  : path to the new file
     numexts   : number of extensions
     product   : product type
+    datestring : DPDATE value, defaulting to the current time, so that
+                 callers writing several files can share one value
 
     In this example, inputs and provenance will be recorded using the file_id
     of the input file.
     """
-    data = numpy.arange(10)
-    datestring = datetime.utcnow().isoformat()
-    hdu = fits.PrimaryHDU(data)
+    data = FAKE_DATA
+    if datestring is None:
+        datestring = datetime.utcnow().isoformat()
     # parse the filepath
     filebase = os.path.basename(filepath)
     file_id, ext = os.path.splitext(filebase)
-    hdu.header.update({
-        'FILE-ID': file_id,
-        'COLLECT': 'TEST',
-        'OBSID': obsid,
+    cards = [
+        ('FILE-ID', file_id),
+        ('COLLECT', 'TEST'),
+    ]
 
-        # DPDATE will be different every time the program runs, so it should be
-        # possible to verify that the files have been updated in AD by checking
-        # this header.
-        'DPDATE': datestring,
+    cards.extend(_common_cards(obsid, product, datestring))
 
-        'PRODUCT': product,
-        'NUMEXTS': numexts,
-        'FIELD1': 'F1%s' % (product),
-        'FIELD2': 'F2%s' % (product),
-    })
+    cards.append(('NUMEXTS', numexts))
 
+    # The dependent headers follow badheader, so they take precedence
+    # over it if the keywords coincide.
     if badheader:
-        hdu.header.update({badheader[0]: badheader[1]})
-
-    # Some product-dependent headers
-    if product != 'A':
-        hdu.header.update({
-            'FIELD3': 'F3%s' % (product),
-            'NOTA': True,
-        })
-    else:
-        hdu.header.update({
-            'NOTA': False,
-        })
+        cards.append((badheader[0], badheader[1]))
 
-    # Some extension-dependent headers
-    hdu.header.update({
-        'FIELD4': 'BAD',
-        'FIELD5': 'GOOD',
-    })
+    cards.extend(_dependent_cards(product, True))
 
     # Composite products have members identified by their file_id's
     if isinstance(member, list):
-        hdu.header.update(OBSCNT=len(member))
-        hdu.header.update({'OBS%d' % (i + 1): name for i, name in enumerate(member)})
+        cards.append(('OBSCNT', len(member)))
+        cards.extend(('OBS%d' % (i + 1), name)
+                     for i, name in enumerate(member))
     elif isinstance(member, str):
-        hdu.header.update(OBSCNT='1')
-        hdu.header.update(OBS1=member)
+        cards.append(('OBSCNT', '1'))
+        cards.append(('OBS1', member))
 
     # Derived products have inputs identified by their file_id's
     if isinstance(provenance, list):
-        hdu.header.update(PRVCNT=len(provenance))
-        hdu.header.update({'PRV%d' % (i + 1): name for i, name in enumerate(provenance)})
+        cards.append(('PRVCNT', len(provenance)))
+        cards.extend(('PRV%d' % (i + 1), name)
+                     for i, name in enumerate(provenance))
     elif isinstance(provenance, str):
-        hdu.header.update(PRVCNT='1')
-        hdu.header.update(PRV1=provenance)
+        cards.append(('PRVCNT', '1'))
+        cards.append(('PRV1', provenance))
 
+    hdu = fits.PrimaryHDU(data)
+    hdu.header.update(cards)
     hdulist = fits.HDUList(hdu)
 
+    # Format the extension-specific keywords and values up front
+    extensions = [
+        ('EXTENSION%d' % (extension),
+         '%s%d' % (product, extension),
+         'HEADER%d' % (extension),
+         'H%s%d' % (product, extension))
+        for extension in range(1, numexts + 1)]
+
     # Optionally add extensions
-    for extension in range(1, numexts + 1):
-        hdu = fits.ImageHDU(data)
-        hdu.header.update({
-            'EXTNAME': 'EXTENSION%d' % (extension),
-            'OBSID': obsid,
-            'PRODUCT': '%s%d' % (product, extension),
-            'DPDATE': datestring,
-            'FIELD1': 'F1%s%d' % (product, extension),
-            'FIELD2': 'F2%s%d' % (product, extension),
-        })
-
-        # Product dependent headers
-        if product != 'A':
-            hdu.header.update({
-                'FIELD3': 'F3%s' % (product),
-                'NOTA': True,
-            })
-        else:
-            hdu.header.update({
-                'NOTA': False,
-            })
-
-        # Extension-dependent headers
-        hdu.header.update({
-            'FIELD4': 'GOOD',
-            'FIELD5': 'BAD',
-
-            # an extension-specific header
-            'HEADER%d' % (extension): 'H%s%d' % (product, extension),
-        })
+    for (extname, extproduct, extkey, extvalue) in extensions:
+        cards = [('EXTNAME', extname)]
+
+        cards.extend(_common_cards(obsid, extproduct, datestring))
+        cards.extend(_dependent_cards(product, False))
 
+        # an extension-specific header
+        cards.append((extkey, extvalue))
+
+        hdu = fits.ImageHDU(data)
+        hdu.header.update(cards)
         hdulist.append(hdu)
 
     hdulist.writeto(filepath)